@@ -1,25 +1,36 @@
 
 import shutil
 import os
-from delta_lake_health.demos.populate_sample_delta import SIMPLE_TABLE_PATH, SKEWED_TABLE_PATH, COMPLEX_TABLE_PATH
+from delta_lake_health.demos.populate_sample_delta import SAMPLE_DIR, SIMPLE_TABLE_PATH, SKEWED_TABLE_PATH, COMPLEX_TABLE_PATH
 
 TABLE_PATH = "./data/tables/tips"
 DATA_DIR = "./data/tables"
+# Top-level data folder the sample tables are written under, independent of the working directory
+SAMPLE_DATA_ROOT = os.path.dirname(os.path.normpath(SAMPLE_DIR))
 
-def clean_delta_data():
-    # Remove the Delta table folder if it exists
+def clean_delta_data(full: bool = False):
+    # Remove the Delta table folders; missing ones are ignored
     for path in [TABLE_PATH, SIMPLE_TABLE_PATH, SKEWED_TABLE_PATH, COMPLEX_TABLE_PATH]:
-        if os.path.exists(path):
+        try:
             shutil.rmtree(path)
-            print(f"Removed Delta table folder: {path}")
-    # Remove the parent data directory if it exists and is empty
-    if os.path.exists(DATA_DIR) and not os.listdir(DATA_DIR):
-        os.rmdir(DATA_DIR)
-        print(f"Removed empty data directory: {DATA_DIR}")
-    # Remove the top-level data folder if it is empty
-    if os.path.exists("./data") and not os.listdir("./data"):
-        os.rmdir("./data")
-        print("Removed empty top-level data directory: ./data")
+        except FileNotFoundError:
+            continue
+        print(f"Removed Delta table folder: {path}")
+    if full:
+        # Wipe everything under the sample data folder, including unrelated files
+        try:
+            shutil.rmtree(SAMPLE_DATA_ROOT)
+            print(f"Removed top-level data directory: {SAMPLE_DATA_ROOT}")
+        except FileNotFoundError:
+            pass
+        return
+    # Remove the parent data directory and the top-level data folder if they are empty
+    for path in [DATA_DIR, "./data"]:
+        try:
+            os.rmdir(path)
+            print(f"Removed empty data directory: {path}")
+        except OSError:
+            pass
 
 if __name__ == "__main__":
     clean_delta_data()
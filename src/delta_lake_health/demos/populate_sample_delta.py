@@ -1,8 +1,9 @@
-import polars as pl
 import numpy as np
-import random
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
 import os
-from datetime import datetime, timedelta
+from datetime import datetime
 from deltalake import write_deltalake, DeltaTable
 
 SAMPLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../../data/tables")
@@ -16,203 +17,239 @@ os.makedirs(COMPLEX_TABLE_PATH, exist_ok=True)
 
 OUTPUT_PATH = COMPLEX_TABLE_PATH
 
+_DAY_LABELS = np.array(["Mon", "Tue", "Wed", "Thu", "Fri"])
+_CATEGORY_LABELS = np.array(["A", "B", "C"])
+_RNG = np.random.default_rng(0)
+
+
+def _day_distribution(dataset: ds.Dataset) -> dict:
+    # Only the partition column is scanned, so no data pages are decoded
+    counts = pc.value_counts(dataset.to_table(columns=["day"])["day"]).to_pylist()
+    return {c["values"]: c["counts"] for c in sorted(counts, key=lambda c: c["counts"], reverse=True)}
+
 
 def create_simple_delta_table():
-    print(f"Creating simple Delta table at: {SIMPLE_TABLE_PATH}")
+    lines: list[str] = []
+    lines.append(f"Creating simple Delta table at: {SIMPLE_TABLE_PATH}")
     
     n_rows = 1000
-    days = ["Mon"] * 200 + ["Tue"] * 200 + ["Wed"] * 200 + ["Thu"] * 200 + ["Fri"] * 200
-    categories = ["A"] * 333 + ["B"] * 333 + ["C"] * 334
-    
-    df = pl.DataFrame({
-        "id": list(range(1, n_rows + 1)),
-        "value": np.random.normal(100, 30, n_rows),
+    now_ts = datetime.now().timestamp()
+    day_offsets = {k: now_ts - k * 86400.0 for k in range(1, 6)}
+    days = np.repeat(_DAY_LABELS, [200, 200, 200, 200, 200])
+    categories = np.repeat(_CATEGORY_LABELS, [333, 333, 334])
+    
+    df = pa.table({
+        "id": np.arange(1, n_rows + 1, dtype=np.int64),
+        "value": _RNG.normal(100, 30, n_rows),
         "day": days,
         "category": categories,
-        "timestamp": [(datetime.now() - timedelta(days=1)).timestamp()] * n_rows
+        "timestamp": np.full(n_rows, day_offsets[1], dtype="float64")
     })
     
     write_deltalake(SIMPLE_TABLE_PATH, df, mode="overwrite", partition_by=["day"])
-    print(f"Initial write: {n_rows} rows with even distribution")
-    
-    append_data = pl.DataFrame({
-        "id": list(range(n_rows + 1, n_rows + 501)),
-        "value": np.random.normal(100, 30, 500),
-        "day": ["Mon"] * 100 + ["Tue"] * 100 + ["Wed"] * 100 + ["Thu"] * 100 + ["Fri"] * 100,
-        "category": ["A"] * 167 + ["B"] * 167 + ["C"] * 166,
-        "timestamp": [datetime.now().timestamp()] * 500
+    lines.append(f"Initial write: {n_rows} rows with even distribution")
+    
+    append_data = pa.table({
+        "id": np.arange(n_rows + 1, n_rows + 501, dtype=np.int64),
+        "value": _RNG.normal(100, 30, 500),
+        "day": np.repeat(_DAY_LABELS, [100, 100, 100, 100, 100]),
+        "category": np.repeat(_CATEGORY_LABELS, [167, 167, 166]),
+        "timestamp": np.full(500, now_ts, dtype="float64")
     })
     write_deltalake(SIMPLE_TABLE_PATH, append_data, mode="append", partition_by=["day"])
-    print("Single append: 500 rows with even distribution")
+    lines.append("Single append: 500 rows with even distribution")
     
     # Final status
     dt = DeltaTable(SIMPLE_TABLE_PATH)
-    print(f"\nSimple table has {len(dt.history())} versions")
-    final_df = pl.read_delta(SIMPLE_TABLE_PATH)
-    print(f"Simple table contains {final_df.shape[0]} records")
+    lines.append(f"\nSimple table has {dt.version() + 1} versions")
+    lines.append(f"Simple table contains {dt.to_pyarrow_dataset().count_rows()} records")
     
+    print("\n".join(lines))
     return SIMPLE_TABLE_PATH
 
 
 def create_skewed_delta_table():
+    lines: list[str] = []
     
-    print(f"Creating skewed Delta table at: {SKEWED_TABLE_PATH}")
+    lines.append(f"Creating skewed Delta table at: {SKEWED_TABLE_PATH}")
     
     n_rows = 1000
-    days = ["Mon"] * 600 + ["Tue"] * 200 + ["Wed"] * 100 + ["Thu"] * 50 + ["Fri"] * 50
-    categories = ["A"] * 500 + ["B"] * 300 + ["C"] * 200
-    
-    df = pl.DataFrame({
-        "id": list(range(1, n_rows + 1)),
-        "value": np.random.normal(100, 30, n_rows),
+    now_ts = datetime.now().timestamp()
+    day_offsets = {k: now_ts - k * 86400.0 for k in range(1, 6)}
+    days = np.repeat(_DAY_LABELS, [600, 200, 100, 50, 50])
+    categories = np.repeat(_CATEGORY_LABELS, [500, 300, 200])
+    
+    df = pa.table({
+        "id": np.arange(1, n_rows + 1, dtype=np.int64),
+        "value": _RNG.normal(100, 30, n_rows),
         "day": days,
         "category": categories,
-        "timestamp": [(datetime.now() - timedelta(days=5)).timestamp()] * n_rows
+        "timestamp": np.full(n_rows, day_offsets[5], dtype="float64")
     })
     
     write_deltalake(SKEWED_TABLE_PATH, df, mode="overwrite", partition_by=["day"])
-    print(f"Initial write: {n_rows} rows with skewed distribution")
-    
-    append1_data = pl.DataFrame({
-        "id": list(range(n_rows + 1, n_rows + 501)),
-        "value": np.random.normal(110, 35, 500),
-        "day": ["Mon"] * 350 + ["Tue"] * 100 + ["Wed"] * 30 + ["Thu"] * 10 + ["Fri"] * 10,
-        "category": ["A"] * 250 + ["B"] * 150 + ["C"] * 100,
-        "timestamp": [(datetime.now() - timedelta(days=4)).timestamp()] * 500
+    lines.append(f"Initial write: {n_rows} rows with skewed distribution")
+    
+    append1_data = pa.table({
+        "id": np.arange(n_rows + 1, n_rows + 501, dtype=np.int64),
+        "value": _RNG.normal(110, 35, 500),
+        "day": np.repeat(_DAY_LABELS, [350, 100, 30, 10, 10]),
+        "category": np.repeat(_CATEGORY_LABELS, [250, 150, 100]),
+        "timestamp": np.full(500, day_offsets[4], dtype="float64")
     })
     write_deltalake(SKEWED_TABLE_PATH, append1_data, mode="append", partition_by=["day"])
-    print("Append 1: 500 rows with skewed distribution")
-    
-    append2_data = pl.DataFrame({
-        "id": list(range(n_rows + 501, n_rows + 1001)),
-        "value": np.random.normal(105, 25, 500),
-        "day": ["Mon"] * 400 + ["Tue"] * 50 + ["Wed"] * 30 + ["Thu"] * 10 + ["Fri"] * 10,
-        "category": ["A"] * 300 + ["B"] * 150 + ["C"] * 50,
-        "timestamp": [(datetime.now() - timedelta(days=3)).timestamp()] * 500
+    lines.append("Append 1: 500 rows with skewed distribution")
+    
+    append2_data = pa.table({
+        "id": np.arange(n_rows + 501, n_rows + 1001, dtype=np.int64),
+        "value": _RNG.normal(105, 25, 500),
+        "day": np.repeat(_DAY_LABELS, [400, 50, 30, 10, 10]),
+        "category": np.repeat(_CATEGORY_LABELS, [300, 150, 50]),
+        "timestamp": np.full(500, day_offsets[3], dtype="float64")
     })
     write_deltalake(SKEWED_TABLE_PATH, append2_data, mode="append", partition_by=["day"])
-    print("Append 2: 500 rows with even more skewed distribution")
-    
-    append3_data = pl.DataFrame({
-        "id": list(range(n_rows + 1001, n_rows + 1501)),
-        "value": np.random.normal(102, 18, 500),
-        "day": ["Mon"] * 450 + ["Tue"] * 20 + ["Wed"] * 15 + ["Thu"] * 10 + ["Fri"] * 5,
-        "category": ["A"] * 350 + ["B"] * 100 + ["C"] * 50,
-        "timestamp": [(datetime.now() - timedelta(days=1)).timestamp()] * 500
+    lines.append("Append 2: 500 rows with even more skewed distribution")
+    
+    append3_data = pa.table({
+        "id": np.arange(n_rows + 1001, n_rows + 1501, dtype=np.int64),
+        "value": _RNG.normal(102, 18, 500),
+        "day": np.repeat(_DAY_LABELS, [450, 20, 15, 10, 5]),
+        "category": np.repeat(_CATEGORY_LABELS, [350, 100, 50]),
+        "timestamp": np.full(500, day_offsets[1], dtype="float64")
     })
     write_deltalake(SKEWED_TABLE_PATH, append3_data, mode="append", partition_by=["day"])
-    print("Append 3: 500 rows with extreme skew")
+    lines.append("Append 3: 500 rows with extreme skew")
     
     dt = DeltaTable(SKEWED_TABLE_PATH)
-    print(f"\nSkewed table has {len(dt.history())} versions")
-    final_df = pl.read_delta(SKEWED_TABLE_PATH)
-    print(f"Skewed table contains {final_df.shape[0]} records")
-    print(f"Distribution by day: {final_df.group_by('day').count().sort('count', descending=True).to_dict()}")
+    lines.append(f"\nSkewed table has {dt.version() + 1} versions")
+    dataset = dt.to_pyarrow_dataset()
+    lines.append(f"Skewed table contains {dataset.count_rows()} records")
+    lines.append(f"Distribution by day: {_day_distribution(dataset)}")
     
+    print("\n".join(lines))
     return SKEWED_TABLE_PATH
 
 
-def create_complex_delta_table():
+def create_complex_delta_table(create_small_files: bool = False):
+    lines: list[str] = []
     
     n_rows = 1000
-    days = ["Mon"] * 400 + ["Tue"] * 200 + ["Wed"] * 200 + ["Thu"] * 100 + ["Fri"] * 100
-    categories = ["A"] * 500 + ["B"] * 300 + ["C"] * 200
-    
-    df = pl.DataFrame({
-        "id": list(range(1, n_rows + 1)),
-        "value": np.random.normal(100, 30, n_rows),
+    now_ts = datetime.now().timestamp()
+    day_offsets = {k: now_ts - k * 86400.0 for k in range(1, 6)}
+    days = np.repeat(_DAY_LABELS, [400, 200, 200, 100, 100])
+    categories = np.repeat(_CATEGORY_LABELS, [500, 300, 200])
+    
+    df = pa.table({
+        "id": np.arange(1, n_rows + 1, dtype=np.int64),
+        "value": _RNG.normal(100, 30, n_rows),
         "day": days,
         "category": categories,
-        "timestamp": [(datetime.now() - timedelta(days=5)).timestamp()] * n_rows
+        "timestamp": np.full(n_rows, day_offsets[5], dtype="float64")
     })
     
-    print(f"Creating complex Delta table at: {COMPLEX_TABLE_PATH}")
+    lines.append(f"Creating complex Delta table at: {COMPLEX_TABLE_PATH}")
     
     write_deltalake(COMPLEX_TABLE_PATH, df, mode="overwrite", partition_by=["day"])
-    print(f"Initial write: {n_rows} rows")
-    
-    day2_data = pl.DataFrame({
-        "id": list(range(n_rows + 1, n_rows + 301)),
-        "value": np.random.normal(110, 35, 300),
-        "day": ["Mon"] * 100 + ["Tue"] * 100 + ["Wed"] * 100,
-        "category": ["A"] * 100 + ["B"] * 100 + ["C"] * 100,
-        "timestamp": [(datetime.now() - timedelta(days=4)).timestamp()] * 300
+    lines.append(f"Initial write: {n_rows} rows")
+    # Reuse one handle and only replay new log entries after each write
+    dt = DeltaTable(COMPLEX_TABLE_PATH)
+    
+    day2_data = pa.table({
+        "id": np.arange(n_rows + 1, n_rows + 301, dtype=np.int64),
+        "value": _RNG.normal(110, 35, 300),
+        "day": np.repeat(_DAY_LABELS[:3], [100, 100, 100]),
+        "category": np.repeat(_CATEGORY_LABELS, [100, 100, 100]),
+        "timestamp": np.full(300, day_offsets[4], dtype="float64")
     })
-    write_deltalake(COMPLEX_TABLE_PATH, day2_data, mode="append", partition_by=["day"])
-    print("Day 2 append: 300 rows")
-    
-    day3_data = pl.DataFrame({
-        "id": list(range(n_rows + 301, n_rows + 501)),
-        "value": np.random.normal(105, 25, 200),
-        "day": ["Thu"] * 100 + ["Fri"] * 100,
-        "category": ["A"] * 100 + ["B"] * 100,
-        "timestamp": [(datetime.now() - timedelta(days=3)).timestamp()] * 200
+    day3_data = pa.table({
+        "id": np.arange(n_rows + 301, n_rows + 501, dtype=np.int64),
+        "value": _RNG.normal(105, 25, 200),
+        "day": np.repeat(_DAY_LABELS[3:], [100, 100]),
+        "category": np.repeat(_CATEGORY_LABELS[:2], [100, 100]),
+        "timestamp": np.full(200, day_offsets[3], dtype="float64")
     })
-    write_deltalake(COMPLEX_TABLE_PATH, day3_data, mode="append", partition_by=["day"])
-    print("Day 3 append: 200 rows")
+    # Days 2 and 3 land back to back, so they share one commit
+    write_deltalake(COMPLEX_TABLE_PATH, pa.concat_tables([day2_data, day3_data]), mode="append", partition_by=["day"])
+    lines.append("Day 2 + Day 3 append: 500 rows")
     
-    dt = DeltaTable(COMPLEX_TABLE_PATH)
+    dt.update_incremental()
     dt.delete("value > 150")
-    print("Deletion operation: Removed rows where value > 150")
-    
-    day4_data = pl.DataFrame({
-        "id": list(range(n_rows + 501, n_rows + 701)),
-        "value": np.random.normal(95, 20, 200),
-        "day": ["Mon"] * 50 + ["Tue"] * 50 + ["Wed"] * 50 + ["Thu"] * 25 + ["Fri"] * 25,
-        "category": ["A"] * 80 + ["B"] * 70 + ["C"] * 50,
-        "timestamp": [(datetime.now() - timedelta(days=2)).timestamp()] * 200
+    lines.append("Deletion operation: Removed rows where value > 150")
+    
+    day4_data = pa.table({
+        "id": np.arange(n_rows + 501, n_rows + 701, dtype=np.int64),
+        "value": _RNG.normal(95, 20, 200),
+        "day": np.repeat(_DAY_LABELS, [50, 50, 50, 25, 25]),
+        "category": np.repeat(_CATEGORY_LABELS, [80, 70, 50]),
+        "timestamp": np.full(200, day_offsets[2], dtype="float64")
     })
     write_deltalake(COMPLEX_TABLE_PATH, day4_data, mode="append", partition_by=["day"])
-    print("Day 4 append: 200 rows")
+    lines.append("Day 4 append: 200 rows")
     
+    dt.update_incremental()
     dt.optimize.compact()
-    print("Performed table optimization")
-    
-    day5_data = pl.DataFrame({
-        "id": list(range(n_rows + 701, n_rows + 901)),
-        "value": np.random.normal(102, 18, 200),
-        "day": ["Mon"] * 80 + ["Tue"] * 40 + ["Wed"] * 40 + ["Thu"] * 20 + ["Fri"] * 20,
-        "category": ["A"] * 100 + ["B"] * 60 + ["C"] * 40,
-        "timestamp": [(datetime.now() - timedelta(days=1)).timestamp()] * 200
+    lines.append("Performed table optimization")
+    
+    day5_data = pa.table({
+        "id": np.arange(n_rows + 701, n_rows + 901, dtype=np.int64),
+        "value": _RNG.normal(102, 18, 200),
+        "day": np.repeat(_DAY_LABELS, [80, 40, 40, 20, 20]),
+        "category": np.repeat(_CATEGORY_LABELS, [100, 60, 40]),
+        "timestamp": np.full(200, day_offsets[1], dtype="float64")
     })
     write_deltalake(COMPLEX_TABLE_PATH, day5_data, mode="append", partition_by=["day"])
-    print("Day 5 append: 200 rows")
+    lines.append("Day 5 append: 200 rows")
     
-    dt = DeltaTable(COMPLEX_TABLE_PATH)
+    dt.update_incremental()
     dt.delete("value < 50")
-    print("Second deletion operation: Removed rows where value < 50")
-    
-    for i in range(10):
-        small_data = pl.DataFrame({
-            "id": [i + 10000],
-            "value": [random.normalvariate(100, 20)],
-            "day": ["Mon"],
-            "category": ["A"],
-            "timestamp": [datetime.now().timestamp()]
+    lines.append("Second deletion operation: Removed rows where value < 50")
+    
+    if create_small_files:
+        # One commit per row to reproduce the small-file pathology
+        for i in range(10):
+            small_data = pa.table({
+                "id": [i + 10000],
+                "value": [_RNG.normal(100, 20)],
+                "day": ["Mon"],
+                "category": ["A"],
+                "timestamp": [now_ts]
+            })
+            write_deltalake(COMPLEX_TABLE_PATH, small_data, mode="append", partition_by=["day"])
+        lines.append("Created 10 small files for demonstration")
+    else:
+        small_data = pa.table({
+            "id": np.arange(10000, 10010, dtype=np.int64),
+            "value": _RNG.normal(100, 20, 10),
+            "day": np.repeat(_DAY_LABELS[:1], 10),
+            "category": np.repeat(_CATEGORY_LABELS[:1], 10),
+            "timestamp": np.full(10, now_ts, dtype="float64")
         })
         write_deltalake(COMPLEX_TABLE_PATH, small_data, mode="append", partition_by=["day"])
-    print("Created 10 small files for demonstration")
+        lines.append("Batch append: 10 rows")
     
-    dt = DeltaTable(COMPLEX_TABLE_PATH)
-    print(f"\nFinal complex table history has {len(dt.history())} versions")
-    final_df = pl.read_delta(COMPLEX_TABLE_PATH)
-    print(f"Final complex table contains {final_df.shape[0]} records")
-    print(f"Distribution by day: {final_df.group_by('day').count().sort('count', descending=True).to_dict()}")
+    dt.update_incremental()
+    lines.append(f"\nFinal complex table history has {dt.version() + 1} versions")
+    dataset = dt.to_pyarrow_dataset()
+    lines.append(f"Final complex table contains {dataset.count_rows()} records")
+    lines.append(f"Distribution by day: {_day_distribution(dataset)}")
     
+    print("\n".join(lines))
     return COMPLEX_TABLE_PATH
 
 
 def create_sample_delta_table():
+    lines: list[str] = []
     
     create_simple_delta_table()
     create_skewed_delta_table()
     create_complex_delta_table()
     
-    print("\nAll three sample Delta tables created successfully:")
-    print(f"1. Simple table (balanced, single append): {SIMPLE_TABLE_PATH}")
-    print(f"2. Skewed table (multiple appends, skewed): {SKEWED_TABLE_PATH}")
-    print(f"3. Complex table (writes, deletes, optimize, skewed): {COMPLEX_TABLE_PATH}")
+    lines.append("\nAll three sample Delta tables created successfully:")
+    lines.append(f"1. Simple table (balanced, single append): {SIMPLE_TABLE_PATH}")
+    lines.append(f"2. Skewed table (multiple appends, skewed): {SKEWED_TABLE_PATH}")
+    lines.append(f"3. Complex table (writes, deletes, optimize, skewed): {COMPLEX_TABLE_PATH}")
     
+    print("\n".join(lines))
     return COMPLEX_TABLE_PATH
 
 
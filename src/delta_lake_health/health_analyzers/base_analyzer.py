@@ -1,7 +1,8 @@
 from enum import Enum
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Sequence
+import numpy as np
 
 
 class HealthStatus(str, Enum):
@@ -14,19 +15,49 @@ class HealthStatus(str, Enum):
     UNKNOWN = "unknown"
 
 
+# Caps for the freshness, optimize, skew and small-files score components
+_SCORE_CAPS = np.array([25.0, 12.5, 25.0, 12.5])
+_SCORE_SIGNS = np.array([1.0, 1.0, -1.0, -1.0])
+# Scores below 50 are very unhealthy, below 80 unhealthy, otherwise healthy
+_SCORE_THRESHOLDS = np.array([50.0, 80.0])
+_STATUS_BY_BUCKET = (HealthStatus.VERY_UNHEALTHY, HealthStatus.UNHEALTHY, HealthStatus.HEALTHY)
+
+_REPORT_HEADER_TEMPLATE = (
+    "\nDelta Table Analysis Results:\n"
+    "----------------------------\n"
+    "Health Score: {health_score:.1f}/100 ({health_status_value})\n"
+    "Version Count: {version_count}\n"
+    "Record Count: {record_count:,}\n"
+    "Operations: {number_of_writes} writes, {number_of_deletes} deletes, {number_of_optimizes} optimizes\n"
+    "Skewness: {skewness_max:.2f} (Max), {skewness_average:.2f} (Avg)"
+)
+_REPORT_STORAGE_TEMPLATE = (
+    "Table Size: {table_size_mb:.2f} MB\n"
+    "Folder Size: {folder_size_mb:.2f} MB\n"
+    "Total Files: {total_file_count} files\n"
+    "Data Files: {data_file_count} files\n"
+    "Small Files: {small_files_count} files\n"
+    "Orphan Files: {orphan_files_count} files\n"
+    "Needs Vacuum: {needs_vacuum}\n"
+    "Has Orphan Files: {has_orphan_files}\n"
+    "Needs Optimize: {needs_optimize}"
+)
+
+
 class DeltaAnalyzerMetrics(BaseModel):
     """
     Base model for Delta Lake health metrics.
     This can be extended to include specific metrics as needed.
+    Analyzers start from model_construct() and assign fields one by one, so
+    model_fields_set (and model_dump(exclude_unset=True)) holds only the
+    fields an analyzer actually filled in.
     """
     version_count: int = 0
-    partition_count: int = 0
     record_count: int = 0
     is_skewed: bool = False
     skewness_max: float = 0.0
     skewness_average: float = 0.0
     is_compacted: bool = False
-    has_orfan_files: bool = False
     number_of_writes: int = 0
     number_of_deletes: int = 0
     number_of_optimizes: int = 0
@@ -49,6 +80,46 @@ class DeltaAnalyzerMetrics(BaseModel):
     health_score: Optional[float] = None
     health_status: Optional[HealthStatus] = None
     
+    def _health_score_inputs(self) -> list[float]:
+        """
+        Collect the raw scoring inputs for this table, in the column order
+        expected by calculate_health_scores:
+            - data freshness, optimize score, skew penalty, small-files penalty
+              (each capped at its maximum)
+            - vacuum score and orphan-file penalty (flat)
+        """
+        sm = self.skew_metrics
+        skewness = sm.get('skewness_max', self.skewness_max) if sm else self.skewness_max
+        return [
+            self.number_of_writes / 10 * 25.0,
+            self.number_of_optimizes / max(self.number_of_writes, 1) * 10 * 12.5,
+            skewness * 100,
+            self.small_files_count / max(self.number_of_writes * 2, 1) * 12.5,
+            0.0 if self.needs_vacuum else 12.5,
+            12.5 if self.has_orphan_files else 0.0,
+        ]
+
+    @classmethod
+    def calculate_health_scores(cls, metrics_list: Sequence['DeltaAnalyzerMetrics']) -> np.ndarray:
+        """
+        Calculate health scores for many tables at once.
+        Every metrics object gets its health_score and health_status updated.
+        Returns:
+            - np.ndarray: Overall health scores (0-100), one per metrics object
+        """
+        inputs = np.array([m._health_score_inputs() for m in metrics_list], dtype=np.float64).reshape(-1, 6)
+        
+        # Freshness and optimize add to the score; skew and small files are penalties
+        # subtracted from the full 25-point balance and storage allowances.
+        capped = np.minimum(inputs[:, :4], _SCORE_CAPS)
+        scores = capped @ _SCORE_SIGNS + 50.0 + inputs[:, 4] - inputs[:, 5]
+        
+        buckets = np.searchsorted(_SCORE_THRESHOLDS, scores, side="right")
+        for metrics, score, bucket in zip(metrics_list, scores, buckets):
+            metrics.health_score = float(score)
+            metrics.health_status = _STATUS_BY_BUCKET[bucket]
+        return scores
+
     def calculate_health_score(self) -> tuple[float, 'HealthStatus']:
         """
         Calculate a comprehensive health score based on multiple metrics.
@@ -56,49 +127,8 @@ class DeltaAnalyzerMetrics(BaseModel):
             - float: Overall health score (0-100)
             - HealthStatus: Categorical health status
         """
-        component_scores = {}
-        
-        max_freshness_score = 25.0
-        freshness_threshold = 10
-        freshness_score = min(self.number_of_writes / freshness_threshold * max_freshness_score, max_freshness_score)
-        component_scores['data_freshness'] = freshness_score
-        
-        max_maintenance_score = 25.0
-        optimize_ratio = self.number_of_optimizes / max(self.number_of_writes, 1)
-        optimize_score = min(optimize_ratio * 10 * (max_maintenance_score/2), max_maintenance_score/2)
-        
-        vacuum_score = 0 if self.needs_vacuum else max_maintenance_score/2
-        
-        maintenance_score = optimize_score + vacuum_score
-        component_scores['maintenance'] = maintenance_score
-        
-        max_balance_score = 25.0
-        skewness = self.skew_metrics.get('skewness_max', self.skewness_max) if self.skew_metrics else self.skewness_max
-        skew_penalty = min(skewness * 100, max_balance_score)
-        balance_score = max_balance_score - skew_penalty
-        component_scores['data_balance'] = balance_score
-        
-        max_storage_score = 25.0
-        small_files_ratio = self.small_files_count / max(self.number_of_writes * 2, 1)
-        small_files_penalty = min(small_files_ratio * (max_storage_score/2), max_storage_score/2)
-        
-        orphan_penalty = max_storage_score/2 if self.has_orphan_files else 0
-        
-        storage_score = max_storage_score - small_files_penalty - orphan_penalty
-        component_scores['storage_efficiency'] = storage_score
-        
-        overall_score = freshness_score + maintenance_score + balance_score + storage_score
-        
-        if overall_score >= 80:
-            status = HealthStatus.HEALTHY
-        elif overall_score >= 50:
-            status = HealthStatus.UNHEALTHY
-        else:
-            status = HealthStatus.VERY_UNHEALTHY
-
-        self.health_score = overall_score
-        self.health_status = status
-        return overall_score, status
+        self.calculate_health_scores([self])
+        return self.health_score, self.health_status
     
     def print_results(self) -> None:
         """
@@ -107,41 +137,45 @@ class DeltaAnalyzerMetrics(BaseModel):
         """
         health_score, health_status = self.calculate_health_score()
         
-        print("\nDelta Table Analysis Results:")
-        print("----------------------------")
-        print(f"Health Score: {health_score:.1f}/100 ({health_status.value})")
-        print(f"Version Count: {self.version_count}")
-        print(f"Record Count: {self.record_count:,}")
-        print(f"Operations: {self.number_of_writes} writes, {self.number_of_deletes} deletes, {self.number_of_optimizes} optimizes")
-        print(f"Skewness: {self.skewness_max:.2f} (Max), {self.skewness_average:.2f} (Avg)")
+        # One dict build feeds both report templates; skew_metrics can hold
+        # every partition, so it is left out of the dump.
+        data = self.model_dump(exclude={'skew_metrics'})
+        data['health_score'] = health_score
+        data['health_status_value'] = health_status.value
+        data['table_size_mb'] = self.table_size_bytes / (1024*1024)
+        data['folder_size_mb'] = self.folder_size_bytes / (1024*1024)
         
-        # Print partition skew metrics if available
-        if self.skew_metrics:
-            print("\nPartition Skew Metrics:")
-            if 'partition_columns' in self.skew_metrics:
-                print(f"Partition Columns: {', '.join(self.skew_metrics['partition_columns'])}")
-            if 'records_per_partition_dict' in self.skew_metrics:
-                records = self.skew_metrics['records_per_partition_dict']
-                print(f"Partition Count: {len(records)}")
+        lines = [_REPORT_HEADER_TEMPLATE.format_map(data)]
+        
+        # Add partition skew metrics if available
+        sm = self.skew_metrics
+        if sm:
+            lines.append("\nPartition Skew Metrics:")
+            partition_columns = sm.get('partition_columns')
+            if partition_columns is not None:
+                lines.append(f"Partition Columns: {', '.join(partition_columns)}")
+            records = sm.get('records_per_partition_dict')
+            if records is not None:
+                lines.append(f"Partition Count: {len(records)}")
                 if records:
-                    max_partition = max(records.items(), key=lambda x: x[1])
-                    min_partition = min(records.items(), key=lambda x: x[1])
-                    print(f"Max Records: {max_partition[1]} (Partition: {max_partition[0]})")
-                    print(f"Min Records: {min_partition[1]} (Partition: {min_partition[0]})")
+                    # Track both extremes in a single pass over the partitions
+                    max_partition = min_partition = None
+                    for partition in records.items():
+                        if max_partition is None or partition[1] > max_partition[1]:
+                            max_partition = partition
+                        if min_partition is None or partition[1] < min_partition[1]:
+                            min_partition = partition
+                    lines.append(f"Max Records: {max_partition[1]} (Partition: {max_partition[0]})")
+                    lines.append(f"Min Records: {min_partition[1]} (Partition: {min_partition[0]})")
         
-        print(f"Table Size: {self.table_size_bytes / (1024*1024):.2f} MB")
-        print(f"Folder Size: {self.folder_size_bytes / (1024*1024):.2f} MB")
-        print(f"Total Files: {self.total_file_count} files")
-        print(f"Data Files: {self.data_file_count} files")
-        print(f"Small Files: {self.small_files_count} files")
-        print(f"Orphan Files: {self.orphan_files_count} files")
-        print(f"Needs Vacuum: {self.needs_vacuum}")
-        print(f"Has Orphan Files: {self.has_orphan_files}")
-        print(f"Needs Optimize: {self.needs_optimize}")
+        lines.append(_REPORT_STORAGE_TEMPLATE.format_map(data))
+        print("\n".join(lines))
         
         return None
 
 class DeltaMetrics(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     operation_type: str
     timestamp: str
     version: int
@@ -149,6 +183,8 @@ class DeltaMetrics(BaseModel):
     parameters: dict = {}
 
 class HealthResult(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     health_metric: int
     health_status: HealthStatus
     metrics: Optional[DeltaAnalyzerMetrics] = None
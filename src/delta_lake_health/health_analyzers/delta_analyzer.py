@@ -1,7 +1,5 @@
 from typing import Optional
 from delta_lake_health.health_analyzers.base_analyzer import HealthResult, DeltaAnalyzerMetrics, HealthStatus
-from delta_lake_health.health_analyzers.delta_python_analyzer import DeltaPythonAnalyzer
-from delta_lake_health.health_analyzers.delta_spark_analyzer import DeltaSparkAnalyzer
 from enum import Enum
 
 
@@ -10,6 +8,9 @@ class Environment(str, Enum):
     DATABRICKS = "databricks"
 
 
+_ENV_BY_STR = {env.value: env for env in Environment}
+
+
 class DeltaAnalyzer:
     """
     Factory class for Delta Lake table analyzers.
@@ -32,7 +33,10 @@ class DeltaAnalyzer:
             spark: Spark session instance, required when environment is "databricks"
         """
         if isinstance(environment, str):
-            self.environment = Environment(environment.lower())
+            try:
+                self.environment = _ENV_BY_STR[environment.lower()]
+            except KeyError:
+                raise ValueError(f"{environment!r} is not a valid Environment") from None
         else:
             self.environment = environment
         self.spark = spark
@@ -40,8 +44,10 @@ class DeltaAnalyzer:
     def create_health_result(self, metrics: DeltaAnalyzerMetrics) -> HealthResult:
         """
         Create a HealthResult from DeltaAnalyzerMetrics.
+        Metrics returned by analyze() are already scored and are not scored again.
         """
-        metrics.calculate_health_score()  # Modifies metrics in place
+        if metrics.health_score is None or metrics.health_status is None:
+            metrics.calculate_health_score()  # Modifies metrics in place
         return HealthResult(
             health_metric=int(metrics.health_score or 0), 
             health_status=metrics.health_status or HealthStatus.UNKNOWN, 
@@ -64,6 +70,7 @@ class DeltaAnalyzer:
         if self.environment == Environment.PYTHON:
             if table_path is None:
                 raise ValueError("table_path must be provided for Python environment")
+            from delta_lake_health.health_analyzers.delta_python_analyzer import DeltaPythonAnalyzer
             analyzer = DeltaPythonAnalyzer()
             metrics = analyzer.analyze_table(
                 table_path=table_path,
@@ -76,6 +83,7 @@ class DeltaAnalyzer:
         elif self.environment == Environment.DATABRICKS:
             if self.spark is None:
                 raise ValueError("Spark session must be provided for Databricks environment")
+            from delta_lake_health.health_analyzers.delta_spark_analyzer import DeltaSparkAnalyzer
             analyzer = DeltaSparkAnalyzer(self.spark)
             metrics = analyzer.analyze_table(
                 table_name=table_name,
@@ -118,5 +126,16 @@ class DeltaAnalyzer:
         return self.create_health_result(metrics)
 
 
-# Export the specific analyzer classes for direct use
+# Export the specific analyzer classes for direct use. They are imported lazily
+# so that Python-only users never pay for the pyspark import (and vice versa).
 __all__ = ['DeltaAnalyzer', 'DeltaPythonAnalyzer', 'DeltaSparkAnalyzer', 'Environment']
+
+
+def __getattr__(name: str):
+    if name == 'DeltaPythonAnalyzer':
+        from delta_lake_health.health_analyzers.delta_python_analyzer import DeltaPythonAnalyzer
+        return DeltaPythonAnalyzer
+    if name == 'DeltaSparkAnalyzer':
+        from delta_lake_health.health_analyzers.delta_spark_analyzer import DeltaSparkAnalyzer
+        return DeltaSparkAnalyzer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
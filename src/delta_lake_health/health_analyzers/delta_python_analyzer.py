@@ -1,10 +1,43 @@
-from typing import Optional
-from delta_lake_health.health_analyzers.base_analyzer import BaseAnalyzer, DeltaAnalyzerMetrics, DeltaMetrics
+from typing import Iterator, Optional, Tuple
+from delta_lake_health.health_analyzers.base_analyzer import BaseAnalyzer, DeltaAnalyzerMetrics
 from deltalake import DeltaTable as RustDeltaTable
 import polars as pl
+import numpy as np
+import pyarrow as pa
+import pyarrow.fs as pafs
 import os
 
 
+_HISTORY_SCHEMA = pa.schema([("operation", pa.string()), ("version", pa.int64())])
+
+
+def _iter_parquet_files(path: str) -> Iterator[Tuple[str, int]]:
+    """
+    Recursively yield (path, size in bytes) for every parquet file under path.
+    Uses os.scandir so each file costs a single stat call.
+    """
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_parquet_files(entry.path)
+            elif entry.name.endswith('.parquet') and entry.is_file():
+                yield entry.path, entry.stat().st_size
+
+
+def _list_remote_parquet_files(uri: str) -> Iterator[Tuple[str, int]]:
+    """
+    Yield (path, size in bytes) for every parquet file under a remote table URI
+    (s3://, abfss://, gs://, ...) from a single recursive pyarrow.fs listing.
+    """
+    filesystem, root = pafs.FileSystem.from_uri(uri)
+    root = root.rstrip('/')
+    base_uri = uri.rstrip('/')
+    for info in filesystem.get_file_info(pafs.FileSelector(root, recursive=True)):
+        if info.type == pafs.FileType.File and info.base_name.endswith('.parquet'):
+            # Report full URIs so paths line up with DeltaTable.file_uris()
+            yield base_uri + info.path[len(root):], info.size
+
+
 class DeltaPythonAnalyzer(BaseAnalyzer):
     """
     Analyzer for Delta Lake tables using Python libraries (no Spark required).
@@ -17,19 +50,50 @@ class DeltaPythonAnalyzer(BaseAnalyzer):
     def _load_data(self, table_path: str) -> RustDeltaTable:
         if table_path is not None:
             dt = RustDeltaTable(table_path)
-            partition_cols = dt.metadata().partition_columns if hasattr(dt.metadata(), "partition_columns") else []
-            if partition_cols:
-                df = pl.read_delta(table_path)
-                self.partition_df = df
-                self.partition_cols = partition_cols
-            else:
-                self.partition_df = None
-                self.partition_cols = []
+            # Partition counts come from the Delta log, so the table data is never loaded here
+            self.partition_df = None
+            self.partition_cols = list(getattr(dt.metadata(), "partition_columns", None) or [])
             self.data = dt
             return dt
         else:
             raise ValueError("table_path must be provided for Python environment.")
         
+    def _partition_counts(self, partition_cols: list) -> pl.DataFrame:
+        """
+        Return one row per partition with its record count in a 'count' column.
+        Counts come from the numRecords stats of the add actions in the Delta log,
+        so no data files are read. Falls back to scanning the partition columns
+        when any file lacks stats.
+        """
+        try:
+            adds = pl.DataFrame(self.data.get_add_actions(flatten=True))
+            if adds.height > 0 and adds["num_records"].null_count() == 0:
+                # Partition values are stored as strings in the log; cast them back
+                # to the column types declared in the Delta schema
+                table_schema = pa.schema(self.data.schema().to_arrow())
+                partition_schema = pa.schema([table_schema.field(col) for col in partition_cols])
+                dtypes = pl.from_arrow(partition_schema.empty_table()).schema
+                return (
+                    adds.select(
+                        *[pl.col(f"partition.{col}").cast(dtypes[col]).alias(col) for col in partition_cols],
+                        pl.col("num_records"),
+                    )
+                    .group_by(partition_cols)
+                    .agg(pl.col("num_records").sum().alias("count"))
+                )
+        except (KeyError, pl.exceptions.ColumnNotFoundError, pl.exceptions.InvalidOperationError):
+            # Missing stats/partition columns or values that do not cast: count by scanning instead
+            pass
+        
+        # Scan only the partition columns straight from Arrow, no pandas round-trip
+        return (
+            pl.scan_delta(self.data)
+            .select(partition_cols)
+            .group_by(partition_cols)
+            .len(name="count")
+            .collect(engine="streaming")
+        )
+
     def analyze_skewness(self, threshold: float = 0.1, method: str = "max") -> float:
         """
         Analyze partition skewness using Polars from a Python DeltaTable.
@@ -39,48 +103,50 @@ class DeltaPythonAnalyzer(BaseAnalyzer):
         """
         if not isinstance(self.data, RustDeltaTable):
             raise TypeError("Partition data not loaded. Make sure to load a partitioned Delta table.")
-        meta = self.data.metadata()
-        partition_cols = getattr(meta, 'partition_columns', [])
+        partition_cols = list(getattr(self.data.metadata(), "partition_columns", None) or [])
         if not partition_cols:
             raise ValueError("No partition columns found in Delta table metadata.")
         
-        df = pl.from_pandas(self.data.to_pandas())
+        counts_df = self._partition_counts(partition_cols)
         
-        counts_df = df.group_by(partition_cols).count()
-        
-        records_per_partition_dict = {}
-        for row in counts_df.iter_rows():
-            if len(partition_cols) == 1:
-                partition_key = str(row[0])
+        if len(partition_cols) == 1:
+            key_series = counts_df[partition_cols[0]]
+            # Polars renders some types differently from str() (e.g. booleans), so only strings skip it;
+            # nulls still become 'None', matching str(None) and the Spark analyzer
+            if key_series.dtype == pl.String:
+                partition_keys = key_series.fill_null("None").to_list()
             else:
-                partition_key = str(tuple(row[:-1]))
-            records_per_partition_dict[partition_key] = row[-1]
+                partition_keys = [str(v) for v in key_series.to_list()]
+        else:
+            partition_keys = [str(t) for t in counts_df.select(partition_cols).iter_rows()]
+        records_per_partition_dict = dict(zip(partition_keys, counts_df['count'].to_list()))
         
-        counts = counts_df.select('count').to_series().to_list()
+        counts = counts_df['count'].to_numpy()
         if len(counts) <= 1:
             return 0.0
         
-        max_count = max(counts)
-        min_count = min(counts)
+        arr = np.asarray(counts, dtype=np.int64)
+        max_count = arr.max()
+        min_count = arr.min()
         if max_count == 0:
             return 0.0
+        mean_count = arr.mean()
+        avg_abs_dev = np.abs(arr - mean_count).mean()
         
+        # Both measures are computed once; method only picks the returned one
+        skewness_max = float((max_count - min_count) / max_count)
+        skewness_average = float(avg_abs_dev / mean_count)
         if method == "max":
-            normalized_skew = (max_count - min_count) / max_count
+            normalized_skew = skewness_max
         elif method == "average":
-            mean_count = sum(counts) / len(counts)
-            avg_abs_dev = sum(abs(c - mean_count) for c in counts) / len(counts)
-            normalized_skew = avg_abs_dev / mean_count if mean_count != 0 else 0.0
+            normalized_skew = skewness_average
         else:
             raise ValueError(f"Unknown skewness method: {method}")
         
-        if not hasattr(self, 'skew_metrics'):
-            self.skew_metrics = {}
-        
         self.skew_metrics = {
             'partition_columns': partition_cols,
-            'skewness_max': normalized_skew if method == "max" else (max_count - min_count) / max_count if max_count > 0 else 0,
-            'skewness_average': normalized_skew if method == "average" else (sum(abs(c - (sum(counts) / len(counts))) for c in counts) / len(counts)) / (sum(counts) / len(counts)) if sum(counts) > 0 else 0,
+            'skewness_max': skewness_max,
+            'skewness_average': skewness_average,
             'is_skewed': normalized_skew > threshold,
             'records_per_partition_dict': records_per_partition_dict
         }
@@ -95,14 +161,14 @@ class DeltaPythonAnalyzer(BaseAnalyzer):
                 raise ValueError("table_path must be provided or DeltaTable must be loaded.")
         total_size = 0
         all_file_paths = []
-        for dirpath, dirnames, filenames in os.walk(table_path):
-            for f in filenames:
-                if not f.endswith('.parquet'):
-                    continue
-                fp = os.path.join(dirpath, f)
-                all_file_paths.append(fp)
-                if os.path.isfile(fp):
-                    total_size += os.path.getsize(fp)
+        if "://" in table_path and not table_path.startswith("file://"):
+            # Object stores return sizes in the listing itself: one request, not one per file
+            file_iter = _list_remote_parquet_files(table_path)
+        else:
+            file_iter = _iter_parquet_files(table_path.removeprefix("file://"))
+        for fp, size in file_iter:
+            all_file_paths.append(fp)
+            total_size += size
         self._all_folder_file_paths = all_file_paths
         return total_size
 
@@ -122,8 +188,12 @@ class DeltaPythonAnalyzer(BaseAnalyzer):
                 file_sizes[fp] = None
                 errors[fp] = str(e)
         total_delta_file_size = sum(sz for sz in file_sizes.values() if sz is not None)
-        delta_file_names = [os.path.basename(fp) for fp in file_paths]
-        all_folder_file_names = [os.path.basename(fp) for fp in getattr(self, '_all_folder_file_paths', [])]
+        # Paths relative to the table root; basenames alone can collide across partitions
+        table_root = self.data.table_uri
+        delta_file_names = frozenset(os.path.relpath(fp, table_root) for fp in file_paths)
+        all_folder_file_names = frozenset(
+            os.path.relpath(fp, table_root) for fp in getattr(self, '_all_folder_file_paths', [])
+        )
         return {
             'delta_file_sizes': file_sizes,
             'total_delta_file_size': total_delta_file_size,
@@ -164,32 +234,20 @@ class DeltaPythonAnalyzer(BaseAnalyzer):
         if not isinstance(self.data, RustDeltaTable):
             raise TypeError("For Python environment, self.data must be a DeltaTable instance.")
         
-        history = self.data.history()
-        ops_summary = {"WRITE": [], "MERGE": [], "DELETE": [], "OPTIMIZE": []}
-        metrics = DeltaAnalyzerMetrics()
-        
-        for entry in history or []:
-            op = entry.get("operation", "")
-            if op in ops_summary:
-                ops_summary[op].append(
-                    DeltaMetrics(
-                        operation_type=op,
-                        timestamp=str(entry.get("timestamp")),
-                        version=entry.get("version", 0),
-                        operation_metrics=entry.get("operationMetrics", {}),
-                        parameters=entry.get("operationParameters", {})
-                ))
-            if op == "WRITE":
-                metrics.number_of_writes += 1
-            elif op == "DELETE":
-                metrics.number_of_deletes += 1
-            elif op == "OPTIMIZE":
-                metrics.number_of_optimizes += 1
-        
-        metrics.version_count = max((entry.get("version", 0) for entry in history), default=0)
+        metrics = DeltaAnalyzerMetrics.model_construct()
+
+        # Only the columns needed for the counts are materialized, as Arrow arrays
+        history = pa.Table.from_pylist(self.data.history() or [], schema=_HISTORY_SCHEMA)
+        # One grouped pass yields both the per-operation counts and the latest version
+        op_stats = history.group_by("operation").aggregate([([], "count_all"), ("version", "max")]).to_pylist()
+        op_counts = {row["operation"]: row["count_all"] for row in op_stats}
+        metrics.number_of_writes = op_counts.get("WRITE", 0)
+        metrics.number_of_deletes = op_counts.get("DELETE", 0)
+        metrics.number_of_optimizes = op_counts.get("OPTIMIZE", 0)
+        metrics.version_count = max((row["version_max"] or 0 for row in op_stats), default=0)
 
         try:
-            self.analyze_skewness(threshold=skew_threshold, method="max")
+            # A single call fills in both skewness_max and skewness_average
             self.analyze_skewness(threshold=skew_threshold, method="average")
             
             if hasattr(self, 'skew_metrics'):
@@ -216,13 +274,18 @@ class DeltaPythonAnalyzer(BaseAnalyzer):
             metrics.folder_size_bytes = 0
             
         try:
-            df = pl.read_delta(self.data.table_uri)
-            metrics.record_count = len(df)
+            # numRecords stats in the Delta log; no data files are read
+            num_records = pl.DataFrame(self.data.get_add_actions(flatten=True))["num_records"]
+            if num_records.null_count() == 0:
+                metrics.record_count = int(num_records.sum())
+            else:
+                metrics.record_count = pl.scan_delta(self.data).select(pl.len()).collect(engine="streaming").item()
         except Exception:
             metrics.record_count = 0
 
+        self._file_usage = {}
         try:
-            file_usage = self.check_delta_file_usage()
+            file_usage = self._file_usage = self.check_delta_file_usage()
             metrics.table_size_bytes = file_usage['total_delta_file_size']
             total_folder_size = metrics.folder_size_bytes
             total_delta_size = metrics.table_size_bytes
@@ -232,15 +295,17 @@ class DeltaPythonAnalyzer(BaseAnalyzer):
             metrics.needs_vacuum = size_ratio < vacuum_size_ratio_threshold
             file_ratio = delta_file_count / all_file_count if all_file_count > 0 else 1.0
             metrics.has_orphan_files = file_ratio < orphan_file_ratio_threshold
-            delta_file_sizes = [size for size in file_usage['delta_file_sizes'].values() if size is not None]
-            if delta_file_sizes:
-                avg_file_size = sum(delta_file_sizes) / len(delta_file_sizes)
+            delta_file_sizes = np.fromiter(
+                (size for size in file_usage['delta_file_sizes'].values() if size is not None), dtype=np.int64
+            )
+            if delta_file_sizes.size:
+                avg_file_size = float(delta_file_sizes.mean())
                 if small_file_size_mb is None:
                     small_file_threshold = avg_file_size
                 else:
                     small_file_threshold = small_file_size_mb * 1024 * 1024
-                small_files_count = sum(1 for size in delta_file_sizes if size < small_file_threshold)
-                metrics.needs_optimize = small_files_count > len(delta_file_sizes) * small_file_ratio_threshold
+                small_files_count = int((delta_file_sizes < small_file_threshold).sum())
+                metrics.needs_optimize = small_files_count > delta_file_sizes.size * small_file_ratio_threshold
                 metrics.small_files_count = small_files_count
                 metrics.avg_file_size_bytes = int(avg_file_size)
             else:
@@ -257,12 +322,12 @@ class DeltaPythonAnalyzer(BaseAnalyzer):
         
         metrics.table_path = self.data.table_uri
         
-        file_usage = self.check_delta_file_usage()
+        file_usage = self._file_usage
         metrics.data_file_count = len(file_usage.get('delta_file_names', []))
         metrics.total_file_count = len(file_usage.get('all_folder_file_names', []))
         
-        all_files = set(file_usage.get('all_folder_file_names', []))
-        delta_files = set(file_usage.get('delta_file_names', []))
+        all_files = file_usage.get('all_folder_file_names', frozenset())
+        delta_files = file_usage.get('delta_file_names', frozenset())
         metrics.orphan_files_count = len(all_files - delta_files)
         
         metrics.files_needing_vacuum = 0 if metrics.needs_vacuum is False else metrics.orphan_files_count
@@ -1,6 +1,7 @@
 from typing import Optional
 from delta_lake_health.health_analyzers.base_analyzer import BaseAnalyzer, DeltaAnalyzerMetrics
 from delta.tables import DeltaTable as SparkDeltaTable
+from pyspark.sql import functions as F
 
 
 class DeltaSparkAnalyzer(BaseAnalyzer):
@@ -35,14 +36,18 @@ class DeltaSparkAnalyzer(BaseAnalyzer):
             self.load_data(table_name=data)
 
     def analyze_skewness(self, table_name: str, partition_cols: list, threshold: float, metrics: DeltaAnalyzerMetrics):
-        partition_cols_str = ", ".join(partition_cols)
-        query = f"""
-        SELECT {partition_cols_str}, COUNT(*) as record_count
-        FROM {table_name}
-        GROUP BY {partition_cols_str}
         """
-        
-        partition_counts = self.spark.sql(query).collect()
+        Compute partition skewness from per-partition record counts of self.data.
+        table_name is no longer used and is kept only for signature compatibility.
+        """
+        # DataFrame API: column names are resolved as identifiers, never spliced into SQL
+        partition_counts = (
+            self.data.toDF()
+            .groupBy(*[F.col(c) for c in partition_cols])
+            # Explicit alias: a partition column named 'count' would shadow groupBy().count()
+            .agg(F.count(F.lit(1)).alias("record_count"))
+            .collect()
+        )
         
         counts = [row['record_count'] for row in partition_counts]
         
@@ -117,7 +122,7 @@ class DeltaSparkAnalyzer(BaseAnalyzer):
         
         history = self.spark.sql(f"DESCRIBE HISTORY {full_table_name}").collect()
         
-        metrics = DeltaAnalyzerMetrics()
+        metrics = DeltaAnalyzerMetrics.model_construct()
         
         metrics.table_size_bytes = table_details.sizeInBytes
         metrics.data_file_count = table_details.numFiles
@@ -1,71 +1,51 @@
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 import plotly.express as px
 from plotly.subplots import make_subplots
 import plotly.graph_objects as go
-from deltalake import DeltaTable
+from delta_lake_health.visualization.notebook.table_cache import get_delta_table
+
+
+_HISTORY_SCHEMA = pa.schema([
+    ('operation', pa.string()),
+    ('timestamp', pa.int64()),
+    ('version', pa.int64())
+])
+
+# DataFrame column -> operationMetrics key
+_INT_METRIC_COLUMNS = {
+    'num_files_added': 'num_added_files',
+    'num_files_removed': 'num_removed_files',
+    'num_rows_added': 'num_added_rows',
+    'num_rows_removed': 'num_removed_rows',
+    'execution_time_ms': 'execution_time_ms'
+}
+
+_IMPORTANT_PARAMS = frozenset(['predicate', 'partitionBy', 'dataChange', 'description'])
+
+# (threshold, divisor, unit) for byte-valued metrics, largest first
+_SIZE_UNITS = ((1024 ** 3, 1024 ** 3, "GB"), (1024 ** 2, 1024 ** 2, "MB"), (1024, 1024, "KB"))
+
+
+def _format_metric_value(k, v):
+    if not isinstance(v, (int, float)):
+        return str(v)
+    if 'time' in k and v > 1000:
+        return f"{v/1000:.2f} seconds"
+    if 'size' in k or 'bytes' in k:
+        for threshold, divisor, unit in _SIZE_UNITS:
+            if v > threshold:
+                return f"{v/divisor:.2f} {unit}"
+    return str(v)
 
 
 def visualize_delta_operations(table_path):
-    dt = DeltaTable(table_path)
+    dt = get_delta_table(table_path)
     history = dt.history()
     
-    operations = []
-    
-    for entry in history:
-        op_type = entry.get("operation", "")
-        timestamp = entry.get("timestamp", "")
-        version = entry.get("version", 0)
-        
-        op_metrics = entry.get("operationMetrics", {})
-        op_params = entry.get("operationParameters", {})
-        
-        hover_text = f"Version: {version}<br>Operation: {op_type}<br>"
-        
-        if op_metrics:
-            hover_text += "<br><b>Operation Metrics:</b><br>"
-            for k, v in op_metrics.items():
-                k_formatted = k.replace('_', ' ').title()
-                if isinstance(v, (int, float)) and 'time' in k and v > 1000:
-                    v_formatted = f"{v/1000:.2f} seconds"
-                elif isinstance(v, (int, float)) and ('size' in k or 'bytes' in k) and v > 1024:
-                    if v > 1024 * 1024 * 1024:
-                        v_formatted = f"{v/(1024**3):.2f} GB"
-                    elif v > 1024 * 1024:
-                        v_formatted = f"{v/(1024**2):.2f} MB"
-                    else:
-                        v_formatted = f"{v/1024:.2f} KB"
-                else:
-                    v_formatted = str(v)
-                hover_text += f"{k_formatted}: {v_formatted}<br>"
-        
-        if op_params:
-            important_params = {k: v for k, v in op_params.items() 
-                               if k in ['predicate', 'partitionBy', 'dataChange', 'description']}
-            if important_params:
-                hover_text += "<br><b>Parameters:</b><br>"
-                for k, v in important_params.items():
-                    k_formatted = k.replace('_', ' ').title()
-                    if isinstance(v, str) and len(v) > 50:
-                        v_formatted = v[:47] + "..."
-                    else:
-                        v_formatted = str(v)
-                    hover_text += f"{k_formatted}: {v_formatted}<br>"
-        
-        operations.append({
-            'operation': op_type,
-            'timestamp': timestamp,
-            'version': version,
-            'hover_text': hover_text,
-            'num_files_added': int(op_metrics.get('num_added_files', 0)),
-            'num_files_removed': int(op_metrics.get('num_removed_files', 0)),
-            'num_rows_added': int(op_metrics.get('num_added_rows', 0)),
-            'num_rows_removed': int(op_metrics.get('num_removed_rows', 0)),
-            'execution_time_ms': int(op_metrics.get('execution_time_ms', 0))
-        })
-    
-    df = pd.DataFrame(operations)
-    
-    if df.empty:
+    if not history:
         fig = go.Figure()
         fig.update_layout(
             title="No operation history available",
@@ -78,7 +58,57 @@ def visualize_delta_operations(table_path):
         )
         return fig
     
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    n = len(history)
+    hover_texts = []
+    int_columns = {name: np.zeros(n, dtype=np.int64) for name in _INT_METRIC_COLUMNS}
+    
+    for i, entry in enumerate(history):
+        get_field = entry.get
+        op_type = get_field("operation", "")
+        version = get_field("version", 0)
+        
+        op_metrics = get_field("operationMetrics") or {}
+        op_params = get_field("operationParameters") or {}
+        
+        parts = [f"Version: {version}", f"Operation: {op_type}"]
+        
+        if op_metrics:
+            parts.append("")
+            parts.append("<b>Operation Metrics:</b>")
+            for k, v in op_metrics.items():
+                parts.append(f"{k.replace('_', ' ').title()}: {_format_metric_value(k, v)}")
+        
+        if op_params:
+            important_params = [(k, v) for k, v in op_params.items() if k in _IMPORTANT_PARAMS]
+            if important_params:
+                parts.append("")
+                parts.append("<b>Parameters:</b>")
+                for k, v in important_params:
+                    v_formatted = v[:47] + "..." if isinstance(v, str) and len(v) > 50 else str(v)
+                    parts.append(f"{k.replace('_', ' ').title()}: {v_formatted}")
+        
+        parts.append("")
+        hover_text = "<br>".join(parts)
+        
+        hover_texts.append(hover_text)
+        # Columns start zeroed, so entries without metrics need no lookups at all
+        if op_metrics:
+            get_metric = op_metrics.get
+            for name, metric_key in _INT_METRIC_COLUMNS.items():
+                int_columns[name][i] = int(get_metric(metric_key, 0) or 0)
+    
+    # The scalar columns go through Arrow in one conversion rather than per-entry appends
+    history_tbl = pa.Table.from_pylist(history, schema=_HISTORY_SCHEMA)
+    df = pa.table({
+        'operation': pc.fill_null(history_tbl.column('operation'), ''),
+        'timestamp': history_tbl.column('timestamp'),
+        'version': pc.fill_null(history_tbl.column('version'), 0),
+    }).to_pandas(self_destruct=True, split_blocks=True)
+    df['hover_text'] = hover_texts
+    for name, values in int_columns.items():
+        df[name] = values
+    
+    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms', utc=True)
     df = df.sort_values('timestamp')
     
     color_map = {
@@ -92,7 +122,7 @@ def visualize_delta_operations(table_path):
         'RESTORE': 'brown'
     }
     
-    df['color'] = df['operation'].map(lambda x: color_map.get(x, 'gray'))
+    df['color'] = df['operation'].map(color_map).fillna('gray')
     
     fig = make_subplots(
         rows=2, cols=1,
@@ -105,16 +135,15 @@ def visualize_delta_operations(table_path):
     for op_type in df['operation'].unique():
         op_df = df[df['operation'] == op_type]
         
-        marker_size = op_df.apply(
-            lambda x: max(10, min(50, 
-                            (x['num_files_added'] + x['num_files_removed'] + 5) * 2)), 
-            axis=1
+        marker_size = np.clip(
+            (op_df['num_files_added'].to_numpy() + op_df['num_files_removed'].to_numpy() + 5) * 2,
+            10, 50
         )
         
         fig.add_trace(
             go.Scatter(
-                x=op_df['timestamp'],
-                y=op_df['version'],
+                x=op_df['timestamp'].to_numpy(),
+                y=op_df['version'].to_numpy(),
                 mode='markers',
                 name=op_type,
                 marker=dict(
@@ -122,7 +151,7 @@ def visualize_delta_operations(table_path):
                     color=color_map.get(op_type, 'gray'),
                     line=dict(width=1, color='darkgray')
                 ),
-                text=op_df['hover_text'],
+                text=op_df['hover_text'].to_numpy(),
                 hoverinfo='text',
                 hoverlabel=dict(
                     bgcolor='white',
@@ -137,8 +166,8 @@ def visualize_delta_operations(table_path):
     
     fig.add_trace(
         go.Bar(
-            x=version_changes.index,
-            y=version_changes['num_files_added'],
+            x=version_changes.index.to_numpy(),
+            y=version_changes['num_files_added'].to_numpy(),
             name='Files Added',
             marker_color='rgba(0, 128, 0, 0.7)'
         ),
@@ -147,8 +176,8 @@ def visualize_delta_operations(table_path):
     
     fig.add_trace(
         go.Bar(
-            x=version_changes.index,
-            y=version_changes['num_files_removed'],
+            x=version_changes.index.to_numpy(),
+            y=version_changes['num_files_removed'].to_numpy(),
             name='Files Removed',
             marker_color='rgba(255, 0, 0, 0.7)'
         ),
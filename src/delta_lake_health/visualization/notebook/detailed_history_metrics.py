@@ -2,7 +2,26 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
 
+_BYTES_TO_MB = 1.0 / (1024**2)
+
+
 def visualize_historical_trends(historical_df):
+    if len(historical_df) < 2:
+        return go.Figure().update_layout(
+            title="Insufficient history (need at least 2 snapshots)",
+            annotations=[dict(
+                text="Run the analyzer again to see trends",
+                showarrow=False,
+                xref="paper", yref="paper",
+                x=0.5, y=0.5
+            )]
+        )
+    
+    # One pass over the frame decides which optional traces have any data; a plain
+    # dict keeps the per-trace lookups off the pandas indexing path
+    has_data = historical_df.notna().any().to_dict()
+    dates = historical_df["date"].to_numpy()
+    
     fig = make_subplots(
         rows=2, cols=2,
         subplot_titles=("Size Growth Over Time", "File Counts Over Time", 
@@ -12,9 +31,9 @@ def visualize_historical_trends(historical_df):
     )
     
     fig.add_trace(
-        go.Scatter(
-            x=historical_df["date"],
-            y=historical_df["table_size_bytes"] / (1024**2),
+        go.Scattergl(
+            x=dates,
+            y=historical_df["table_size_bytes"].to_numpy() * _BYTES_TO_MB,
             name="Table Size (MB)",
             line=dict(color="royalblue", width=3)
         ),
@@ -22,9 +41,9 @@ def visualize_historical_trends(historical_df):
     )
     
     fig.add_trace(
-        go.Scatter(
-            x=historical_df["date"],
-            y=historical_df["folder_size_bytes"] / (1024**2),
+        go.Scattergl(
+            x=dates,
+            y=historical_df["folder_size_bytes"].to_numpy() * _BYTES_TO_MB,
             name="Folder Size (MB)",
             line=dict(color="red", width=3, dash="dot")
         ),
@@ -32,119 +51,119 @@ def visualize_historical_trends(historical_df):
     )
     
     fig.add_trace(
-        go.Scatter(
-            x=historical_df["date"],
-            y=historical_df["record_count"],
+        go.Scattergl(
+            x=dates,
+            y=historical_df["record_count"].to_numpy(),
             name="Record Count",
             line=dict(color="green", width=2)
         ),
         row=1, col=1, secondary_y=True
     )
     
-    if "total_file_count" in historical_df.columns and not historical_df["total_file_count"].isna().all():
+    if has_data.get("total_file_count", False):
         fig.add_trace(
-            go.Scatter(
-                x=historical_df["date"],
-                y=historical_df["total_file_count"],
+            go.Scattergl(
+                x=dates,
+                y=historical_df["total_file_count"].to_numpy(),
                 name="Total Files",
                 line=dict(color="blue", width=3)
             ),
             row=1, col=2
         )
     
-    if "data_file_count" in historical_df.columns and not historical_df["data_file_count"].isna().all():
+    if has_data.get("data_file_count", False):
         fig.add_trace(
-            go.Scatter(
-                x=historical_df["date"],
-                y=historical_df["data_file_count"],
+            go.Scattergl(
+                x=dates,
+                y=historical_df["data_file_count"].to_numpy(),
                 name="Data Files",
                 line=dict(color="purple", width=3)
             ),
             row=1, col=2
         )
     
-    if "small_files_count" in historical_df.columns and not historical_df["small_files_count"].isna().all():
+    if has_data.get("small_files_count", False):
         fig.add_trace(
-            go.Scatter(
-                x=historical_df["date"],
-                y=historical_df["small_files_count"],
+            go.Scattergl(
+                x=dates,
+                y=historical_df["small_files_count"].to_numpy(),
                 name="Small Files",
                 line=dict(color="orange", width=3)
             ),
             row=1, col=2
         )
     
-    if "orphan_files_count" in historical_df.columns and not historical_df["orphan_files_count"].isna().all():
+    if has_data.get("orphan_files_count", False):
         fig.add_trace(
-            go.Scatter(
-                x=historical_df["date"],
-                y=historical_df["orphan_files_count"],
+            go.Scattergl(
+                x=dates,
+                y=historical_df["orphan_files_count"].to_numpy(),
                 name="Orphan Files",
                 line=dict(color="red", width=3)
             ),
             row=1, col=2
         )
     
-    if "file_size_efficiency" in historical_df.columns and not historical_df["file_size_efficiency"].isna().all():
+    if has_data.get("file_size_efficiency", False):
         fig.add_trace(
-            go.Scatter(
-                x=historical_df["date"],
-                y=historical_df["file_size_efficiency"],
+            go.Scattergl(
+                x=dates,
+                y=historical_df["file_size_efficiency"].to_numpy(),
                 name="File Size Efficiency",
                 line=dict(color="teal", width=3)
             ),
             row=2, col=1, secondary_y=False
         )
     
-    if "storage_efficiency" in historical_df.columns and not historical_df["storage_efficiency"].isna().all():
+    if has_data.get("storage_efficiency", False):
         fig.add_trace(
-            go.Scatter(
-                x=historical_df["date"],
-                y=historical_df["storage_efficiency"],
+            go.Scattergl(
+                x=dates,
+                y=historical_df["storage_efficiency"].to_numpy(),
                 name="Storage Efficiency",
                 line=dict(color="darkorange", width=3)
             ),
             row=2, col=1, secondary_y=False
         )
     
-    if "partition_skewness" in historical_df.columns and not historical_df["partition_skewness"].isna().all():
+    if has_data.get("partition_skewness", False):
         fig.add_trace(
-            go.Scatter(
-                x=historical_df["date"],
-                y=historical_df["partition_skewness"],
+            go.Scattergl(
+                x=dates,
+                y=historical_df["partition_skewness"].to_numpy(),
                 name="Partition Skewness",
                 line=dict(color="brown", width=3)
             ),
             row=2, col=1, secondary_y=True
         )
     
-    if "number_of_writes" in historical_df.columns and not historical_df["number_of_writes"].isna().all():
+    if has_data.get("number_of_writes", False):
         fig.add_trace(
-            go.Scatter(
-                x=historical_df["date"],
-                y=historical_df["number_of_writes"],
+            go.Scattergl(
+                x=dates,
+                y=historical_df["number_of_writes"].to_numpy(),
                 name="Writes",
                 line=dict(color="blue", width=3)
             ),
             row=2, col=2
         )
     
-    if "number_of_deletes" in historical_df.columns and not historical_df["number_of_deletes"].isna().all():
+    if has_data.get("number_of_deletes", False):
         fig.add_trace(
-            go.Scatter(
-                x=historical_df["date"],
-                y=historical_df["number_of_deletes"],
+            go.Scattergl(
+                x=dates,
+                y=historical_df["number_of_deletes"].to_numpy(),
                 name="Deletes",
                 line=dict(color="red", width=3)
             ),
             row=2, col=2
         )
     
-    if "number_of_optimizes" in historical_df.columns and not historical_df["number_of_optimizes"].isna().all():
+    if has_data.get("number_of_optimizes", False):
         fig.add_trace(
-            go.Scatter(
-                x=historical_df["date"],
-                y=historical_df["number_of_optimizes"],
+            go.Scattergl(
+                x=dates,
+                y=historical_df["number_of_optimizes"].to_numpy(),
                 name="Optimizes",
                 line=dict(color="green", width=3)
             ),
@@ -1,54 +1,41 @@
-import os
 import numpy as np
 import pandas as pd
-from deltalake import DeltaTable
+import pyarrow as pa
+from delta_lake_health.visualization.notebook.table_cache import get_delta_table
 from plotly.subplots import make_subplots
 import plotly.graph_objects as go
 from delta_lake_health.health_analyzers.base_analyzer import HealthStatus
 
 
 def analyze_file_distribution(table_path, analyzer=None):
-    dt = DeltaTable(table_path)
-    file_uris = dt.file_uris()
-    
-    file_sizes = []
-    file_names = []
-    
-    for uri in file_uris:
-        if uri.startswith("file://"):
-            local_path = uri[7:]
-        else:
-            local_path = uri
-            
-        if "_delta_log" in local_path:
-            continue
-            
-        try:
-            file_size = os.path.getsize(local_path)
-            file_sizes.append(file_size / (1024 * 1024))
-            file_names.append(os.path.basename(local_path))
-        except (FileNotFoundError, OSError):
-            continue
+    dt = get_delta_table(table_path)
+    # Sizes come from the add actions in the Delta log: no filesystem calls, and
+    # the log never lists _delta_log files as data
+    add_df = pa.record_batch(dt.get_add_actions(flatten=True)).select(["path", "size_bytes"]).to_pandas()
     
     files_df = pd.DataFrame({
-        "file_name": file_names,
-        "size_mb": file_sizes
+        "file_name": add_df["path"].str.rsplit("/", n=1).str[-1],
+        "size_mb": add_df["size_bytes"] / (1024 * 1024)
     })
     
     files_df = files_df.sort_values("size_mb", ascending=False)
     
     fig = make_subplots(
         rows=1, cols=2,
-        specs=[[{"type": "histogram"}, {"type": "bar"}]],
+        specs=[[{"type": "bar"}, {"type": "bar"}]],
         subplot_titles=("File Size Histogram", "Partition Record Count")
     )
     
+    # Bin on the server so the figure carries 20 bars instead of every file size
+    counts, edges = np.histogram(files_df["size_mb"].to_numpy(), bins=20)
     fig.add_trace(
-        go.Histogram(
-            x=files_df["size_mb"],
-            nbinsx=20,
+        go.Bar(
+            x=0.5 * (edges[:-1] + edges[1:]),
+            y=counts,
+            width=np.diff(edges),
+            customdata=np.column_stack([edges[:-1], edges[1:]]),
             marker_color="green",
-            hovertemplate="Size range: %{x} MB<br>Count: %{y}<extra></extra>"
+            hovertemplate="Size range: %{customdata[0]:.3f} - %{customdata[1]:.3f} MB<br>Count: %{y}<extra></extra>"
         ),
         row=1, col=1
     )
@@ -66,20 +53,23 @@ def analyze_file_distribution(table_path, analyzer=None):
                 partition_cols = metrics.skew_metrics.get('partition_columns', ['partition'])
                 
                 partitions_df = pd.DataFrame({
-                    'partition': list(records_per_partition.keys()),
+                    'partition': pd.Categorical(list(records_per_partition.keys())),
                     'record_count': list(records_per_partition.values())
                 })
-                partitions_df = partitions_df.sort_values('record_count', ascending=False)
                 
+                # Partial selection of the largest partitions instead of a full sort
                 top_n = min(20, len(partitions_df))
-                top_partitions = partitions_df.head(top_n)
+                vals = partitions_df['record_count'].to_numpy()
+                idx = np.argpartition(vals, -top_n)[-top_n:] if top_n else np.arange(0)
+                idx = idx[np.argsort(-vals[idx], kind='stable')]
+                top_partitions = partitions_df.iloc[idx]
                 
                 fig.add_trace(
                     go.Bar(
-                        x=top_partitions["partition"],
-                        y=top_partitions["record_count"],
+                        x=top_partitions["partition"].to_numpy(),
+                        y=top_partitions["record_count"].to_numpy(),
                         marker_color="royalblue",
-                        text=top_partitions["record_count"],
+                        text=top_partitions["record_count"].to_numpy(),
                         textposition="auto",
                         hovertemplate="<b>%{x}</b><br>Records: %{y}<extra></extra>"
                     ),
@@ -8,7 +8,7 @@ def create_health_dashboard(metrics: DeltaAnalyzerMetrics):
 
     fig = make_subplots(
         rows=2, cols=2,
-        specs=[[{"type": "indicator"}, {"type": "indicator"}],
+        specs=[[{"type": "indicator"}, {"type": "table"}],
                [{"type": "table"}, {"type": "bar"}]],
         subplot_titles=("", "Table Metrics", 
                        "Recommended Actions", "Operation Counts"),
@@ -61,21 +61,28 @@ def create_health_dashboard(metrics: DeltaAnalyzerMetrics):
     ]
     display_metrics = [(label, value) for label, value in zip(metrics_labels, metrics_values) if value is not None]
     
-    for i, (label, value) in enumerate(display_metrics):
-        if isinstance(value, float):
-            value_str = f"{value:,.2f}"
-        elif isinstance(value, int):
-            value_str = f"{value:,}"
-        else:
-            value_str = str(value)
-        
-        fig.add_annotation(
-            x=0.75, y=0.95 - i*0.08,
-            xref="paper", yref="paper",
-            text=f"{label}: <b>{value_str}</b>",
-            showarrow=False,
-            font=dict(size=11),
-            align="left"
+    if display_metrics:
+        labels, values = zip(*display_metrics)
+        formatted_values = [
+            f"{value:,.2f}" if isinstance(value, float) else f"{value:,}" if isinstance(value, int) else str(value)
+            for value in values
+        ]
+        fig.add_trace(
+            go.Table(
+                header=dict(
+                    values=["Metric", "Value"],
+                    fill_color='royalblue',
+                    align='left',
+                    font=dict(color='white', size=12)
+                ),
+                cells=dict(
+                    values=[list(labels), formatted_values],
+                    fill_color='lavender',
+                    align='left',
+                    font=dict(size=11)
+                )
+            ),
+            row=1, col=2
         )
     
     recommendations = []
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import plotly.express as px
 from plotly.subplots import make_subplots
@@ -42,21 +43,29 @@ def visualize_skew_analysis(metrics):
     
     partition_cols = skew_metrics.get('partition_columns', ['partition'])
     
-    df = pd.DataFrame({
-        'partition': list(records_per_partition.keys()),
-        'record_count': list(records_per_partition.values())
-    }).sort_values('record_count', ascending=False)
+    # records_per_partition is non-empty here, so the reductions are always defined
+    counts = np.fromiter(records_per_partition.values(), dtype=np.float64, count=len(records_per_partition))
+    max_count, min_count, count_mean, count_stddev = counts.max(), counts.min(), counts.mean(), counts.std()
     
+    # Single pass over the dict; the top-K selection below makes a full sort unnecessary
+    df = pd.Series(records_per_partition, name='record_count').rename_axis('partition').reset_index()
+    # Partition keys are long tuple strings; integer codes keep the column small
+    df['partition'] = df['partition'].astype('category')
+    
+    # Partial selection of the largest partitions instead of a full sort
     top_n = min(15, len(df))
-    top_df = df.head(top_n)
+    vals = df['record_count'].to_numpy()
+    idx = np.argpartition(vals, -top_n)[-top_n:]
+    idx = idx[np.argsort(-vals[idx], kind='stable')]
+    top_df = df.iloc[idx]
     
     # Bar chart for partition distribution
     fig.add_trace(
         go.Bar(
-            x=top_df['partition'],
-            y=top_df['record_count'],
+            x=top_df['partition'].to_numpy(),
+            y=top_df['record_count'].to_numpy(),
             marker_color='royalblue',
-            text=top_df['record_count'],
+            text=top_df['record_count'].to_numpy(),
             textposition='auto',
             hovertemplate="<b>%{x}</b><br>Records: %{y}<extra></extra>"
         ),
@@ -64,7 +73,7 @@ def visualize_skew_analysis(metrics):
     )
     
     # Add a line for average records per partition
-    avg_records = df['record_count'].mean()
+    avg_records = count_mean
     fig.add_shape(
         type="line",
         x0=-0.5, y0=avg_records, x1=top_n-0.5, y1=avg_records,
@@ -82,20 +91,19 @@ def visualize_skew_analysis(metrics):
     )
     
     # Pie chart for partition breakdown
+    # idx is already sorted and holds more than 10 entries whenever df does,
+    # so the tail is the total minus the top 10 with no second scan or concat
+    pie_labels = top_df['partition'].to_numpy()
+    pie_values = vals[idx]
     if len(df) > 10:
-        top_10 = df.head(10).copy()
-        others = pd.DataFrame({
-            'partition': ['Others'],
-            'record_count': [df.iloc[10:]['record_count'].sum()]
-        })
-        pie_df = pd.concat([top_10, others])
-    else:
-        pie_df = df
+        tail_sum = vals.sum() - pie_values[:10].sum()
+        pie_labels = np.append(pie_labels[:10], 'Others')
+        pie_values = np.append(pie_values[:10], tail_sum)
     
     fig.add_trace(
         go.Pie(
-            labels=pie_df['partition'],
-            values=pie_df['record_count'],
+            labels=pie_labels,
+            values=pie_values,
             hole=0.4,
             textinfo='percent+label',
             insidetextorientation='radial',
@@ -136,12 +144,6 @@ def visualize_skew_analysis(metrics):
         row=2, col=1
     )
     
-    count_values = list(records_per_partition.values())
-    max_count = max(count_values) if count_values else 0
-    min_count = min(count_values) if count_values else 0
-    count_mean = sum(count_values) / len(count_values) if count_values else 0
-    count_stddev = (sum((c - count_mean)**2 for c in count_values) / len(count_values))**0.5 if count_values else 0
-    
     metrics_to_show = [
         ("Max Records", max_count),
         ("Min Records", min_count),
@@ -163,7 +165,8 @@ def visualize_skew_analysis(metrics):
         title_text=f"Partition Skew Analysis ({', '.join(partition_cols)})",
         height=700,
         width=1000,
-        showlegend=False
+        showlegend=False,
+        hovermode='x'
     )
     
     fig.update_xaxes(title_text="Partition", tickangle=45, row=1, col=1)
@@ -0,0 +1,44 @@
+import os
+from functools import lru_cache
+from typing import Hashable
+from deltalake import DeltaTable
+import pyarrow.fs as pafs
+
+
+_FIRST_COMMIT = "_delta_log/00000000000000000000.json"
+
+
+def _log_identity(table_path: str) -> Hashable:
+    """
+    Identity of the Delta log at table_path: the inode and mtime of its first
+    commit file. Deleting and recreating a table at the same path rewrites that
+    file, so a recreated table never reuses a handle built for the old one.
+    """
+    if "://" not in table_path:
+        try:
+            st = os.stat(os.path.join(table_path, _FIRST_COMMIT))
+            return st.st_ino, st.st_mtime_ns
+        except OSError:
+            return None
+    try:
+        filesystem, root = pafs.FileSystem.from_uri(table_path)
+        info = filesystem.get_file_info(root.rstrip("/") + "/" + _FIRST_COMMIT)
+        return info.type, info.mtime_ns, info.size
+    except (OSError, ValueError):
+        return None
+
+
+@lru_cache(maxsize=32)
+def _cached_delta_table(table_path: str, log_identity: Hashable) -> DeltaTable:
+    return DeltaTable(table_path)
+
+
+def get_delta_table(table_path: str) -> DeltaTable:
+    """
+    Return a DeltaTable for table_path, reusing the one built by an earlier
+    visualization call for the same Delta log. The cached table is brought up to
+    the latest version with update_incremental(), which only replays new commits.
+    """
+    dt = _cached_delta_table(table_path, _log_identity(table_path))
+    dt.update_incremental()
+    return dt
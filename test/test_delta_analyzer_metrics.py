@@ -1,34 +1,63 @@
-import pytest
-import tempfile
+import ast
 import shutil
+from pathlib import Path
+import pytest
 import polars as pl
 import numpy as np
-from deltalake import write_deltalake
+from deltalake import DeltaTable, write_deltalake
 from delta_lake_health.health_analyzers.delta_analyzer import DeltaAnalyzer, Environment
+from delta_lake_health.health_analyzers.base_analyzer import DeltaAnalyzerMetrics, HealthStatus
 
-@pytest.fixture(scope="module")
-def tmp_delta_table():
-    tmpdir = tempfile.mkdtemp()
-    table_path = f"{tmpdir}/tips"
-    n_rows = 100
-    days = ["Mon"] * 80 + ["Tue"] * 10 + ["Wed"] * 10
-    times = ["Dinner"] * 80 + ["Lunch"] * 10 + ["Lunch"] * 10
-    df = pl.DataFrame({
-        "total_bill": np.random.uniform(10, 50, n_rows),
-        "tip": np.random.uniform(1, 10, n_rows),
+PARTITION_BY = ["day", "time"]
+
+
+def _tips_df(days, times, seed):
+    # A fresh generator per call, so each table's data does not depend on test order
+    rng = np.random.default_rng(seed)
+    n_rows = len(days)
+    return pl.DataFrame({
+        "total_bill": rng.uniform(10, 50, n_rows),
+        "tip": rng.uniform(1, 10, n_rows),
         "day": days,
         "time": times,
-        "size": np.random.randint(1, 5, n_rows)
+        "size": rng.integers(1, 5, n_rows)
     })
-    write_deltalake(table_path, df, mode="overwrite", partition_by=["day", "time"])
-    for _ in range(3):
-        write_deltalake(table_path, df.sample(10), mode="append", partition_by=["day", "time"])
-    from deltalake import DeltaTable
-    dt = DeltaTable(table_path)
-    dt.delete("total_bill > 40")
-    dt.optimize.compact()
-    yield table_path
-    shutil.rmtree(tmpdir)
+
+def _write_tips_table(table_path, df, appends=0, compact=False):
+    write_deltalake(table_path, df, mode="overwrite", partition_by=PARTITION_BY)
+    for i in range(appends):
+        write_deltalake(table_path, df.sample(10, seed=i), mode="append", partition_by=PARTITION_BY)
+    if compact:
+        dt = DeltaTable(table_path)
+        dt.delete("total_bill > 40")
+        dt.optimize.compact()
+    return table_path
+
+@pytest.fixture(scope="session")
+def skewed_df():
+    days = ["Mon"] * 80 + ["Tue"] * 10 + ["Wed"] * 10
+    times = ["Dinner"] * 80 + ["Lunch"] * 10 + ["Lunch"] * 10
+    return _tips_df(days, times, seed=0)
+
+@pytest.fixture(scope="session")
+def balanced_df():
+    days = ["Mon"] * 50 + ["Tue"] * 50
+    times = ["Dinner"] * 50 + ["Lunch"] * 50
+    return _tips_df(days, times, seed=1)
+
+@pytest.fixture(scope="session")
+def tmp_delta_table(tmp_path_factory, skewed_df):
+    table_path = tmp_path_factory.mktemp("tips") / "tips"
+    return _write_tips_table(str(table_path), skewed_df.clone(), appends=3, compact=True)
+
+@pytest.fixture(scope="session")
+def skewed_delta_table(tmp_path_factory, skewed_df):
+    table_path = tmp_path_factory.mktemp("tips_skew") / "tips_skew"
+    return _write_tips_table(str(table_path), skewed_df.clone())
+
+@pytest.fixture(scope="module")
+def python_analyzer():
+    return DeltaAnalyzer(environment="python")
 
 def test_delta_analyzer_metrics_and_skewness(tmp_delta_table):
     analyzer = DeltaAnalyzer(environment=Environment.PYTHON)
@@ -40,91 +69,47 @@ def test_delta_analyzer_metrics_and_skewness(tmp_delta_table):
     assert metrics.skewness_max > 0.7
     assert metrics.skewness_average > 0.2
 
-def test_delta_analyzer_no_skewness():
-    tmpdir = tempfile.mkdtemp()
-    table_path = f"{tmpdir}/tips_noskew"
-    n_rows = 120
+def test_delta_analyzer_no_skewness(tmp_path):
     days = ["Mon"] * 60 + ["Tue"] * 60
     times = ["Dinner"] * 30 + ["Lunch"] * 30 + ["Dinner"] * 30 + ["Lunch"] * 30
-    df = pl.DataFrame({
-        "total_bill": np.random.uniform(10, 50, n_rows),
-        "tip": np.random.uniform(1, 10, n_rows),
-        "day": days,
-        "time": times,
-        "size": np.random.randint(1, 5, n_rows)
-    })
-    write_deltalake(table_path, df, mode="overwrite", partition_by=["day", "time"])
+    table_path = _write_tips_table(str(tmp_path / "tips_noskew"), _tips_df(days, times, seed=2))
     analyzer = DeltaAnalyzer(environment=Environment.PYTHON)
     metrics = analyzer.analyze(table_path=table_path)
     assert metrics.skewness_max < 0.01
     assert metrics.skewness_average < 0.01
-    shutil.rmtree(tmpdir)
 
-def test_table_size_metrics_no_orphan_files():
-    tmpdir = tempfile.mkdtemp()
-    table_path = f"{tmpdir}/tips_no_orphan"
-    n_rows = 100
-    days = ["Mon"] * 50 + ["Tue"] * 50
-    times = ["Dinner"] * 50 + ["Lunch"] * 50
-    df = pl.DataFrame({
-        "total_bill": np.random.uniform(10, 50, n_rows),
-        "tip": np.random.uniform(1, 10, n_rows),
-        "day": days,
-        "time": times,
-        "size": np.random.randint(1, 5, n_rows)
-    })
-    write_deltalake(table_path, df, mode="overwrite", partition_by=["day", "time"])
-    analyzer = DeltaAnalyzer(environment="python")
+@pytest.mark.parametrize("writes, threshold, expected_orphan", [
     # Use a lower threshold to avoid false positives for orphan files
-    metrics = analyzer.analyze(table_path=table_path, orphan_file_ratio_threshold=0.5)
+    (0, 0.5, False),
+    (10, 0.8, True),
+])
+def test_table_size_metrics_orphan_files(tmp_path, balanced_df, python_analyzer, writes, threshold, expected_orphan):
+    # Appends followed by a delete and a compaction leave unreferenced files behind
+    table_path = _write_tips_table(str(tmp_path / "tips"), balanced_df.clone(), appends=writes, compact=writes > 0)
+    metrics = python_analyzer.analyze(table_path=table_path, orphan_file_ratio_threshold=threshold)
     assert metrics is not None
-    assert metrics.has_orphan_files is False
-    shutil.rmtree(tmpdir)
+    assert metrics.has_orphan_files is expected_orphan
 
-def test_table_size_metrics_many_orphan_files():
-    tmpdir = tempfile.mkdtemp()
-    table_path = f"{tmpdir}/tips_orphan"
-    n_rows = 100
-    days = ["Mon"] * 50 + ["Tue"] * 50
-    times = ["Dinner"] * 50 + ["Lunch"] * 50
-    df = pl.DataFrame({
-        "total_bill": np.random.uniform(10, 50, n_rows),
-        "tip": np.random.uniform(1, 10, n_rows),
-        "day": days,
-        "time": times,
-        "size": np.random.randint(1, 5, n_rows)
-    })
-    write_deltalake(table_path, df, mode="overwrite", partition_by=["day", "time"])
-    for _ in range(10):
-        write_deltalake(table_path, df.sample(10), mode="append", partition_by=["day", "time"])
-    from deltalake import DeltaTable
-    dt = DeltaTable(table_path)
-    dt.delete("total_bill > 40")
-    dt.optimize.compact()
-    analyzer = DeltaAnalyzer(environment="python")
-    metrics = analyzer.analyze(table_path=table_path, orphan_file_ratio_threshold=0.8)
-    assert metrics is not None
-    assert metrics.has_orphan_files is True
-    shutil.rmtree(tmpdir)
+def test_orphan_file_with_referenced_basename_is_counted(tmp_path, balanced_df, python_analyzer):
+    table_path = _write_tips_table(str(tmp_path / "tips"), balanced_df.clone())
+    live_files = [Path(uri) for uri in DeltaTable(table_path).file_uris()]
+    referenced = live_files[0]
+    other_partition = next(f.parent for f in live_files if f.parent != referenced.parent)
+    # Same basename as a live file, but nothing in the log points at this copy
+    shutil.copy(referenced, other_partition / referenced.name)
+    metrics = python_analyzer.analyze(table_path=table_path)
+    assert metrics.orphan_files_count == 1
 
-def test_skew_metrics_dictionary():
-    tmpdir = tempfile.mkdtemp()
-    table_path = f"{tmpdir}/tips_skew"
-    n_rows = 100
-    days = ["Mon"] * 80 + ["Tue"] * 10 + ["Wed"] * 10
-    times = ["Dinner"] * 80 + ["Lunch"] * 10 + ["Lunch"] * 10
-    df = pl.DataFrame({
-        "total_bill": np.random.uniform(10, 50, n_rows),
-        "tip": np.random.uniform(1, 10, n_rows),
-        "day": days,
-        "time": times,
-        "size": np.random.randint(1, 5, n_rows)
-    })
-    
-    write_deltalake(table_path, df, mode="overwrite", partition_by=["day", "time"])
-    
+def test_null_partition_value_key_is_none_string(tmp_path, python_analyzer):
+    table_path = str(tmp_path / "nulls")
+    df = pl.DataFrame({"d": ["a", "a", "b", None, None, None], "x": range(6)})
+    write_deltalake(table_path, df, partition_by=["d"])
+    metrics = python_analyzer.analyze(table_path=table_path)
+    assert metrics.skew_metrics['records_per_partition_dict'] == {'a': 2, 'b': 1, 'None': 3}
+
+def test_skew_metrics_dictionary(skewed_delta_table):
     analyzer = DeltaAnalyzer(environment="python")
-    metrics = analyzer.analyze(table_path=table_path)
+    metrics = analyzer.analyze(table_path=skewed_delta_table)
     
     assert 'skew_metrics' in metrics.__dict__
     assert 'partition_columns' in metrics.skew_metrics
@@ -145,6 +130,20 @@ def test_skew_metrics_dictionary():
     
     max_partition = max(records_per_partition.items(), key=lambda x: x[1])
     assert max_partition[1] >= 70
-    assert 'Mon' in max_partition[0] or ('Mon', 'Dinner') == eval(max_partition[0])
-    
-    shutil.rmtree(tmpdir)
+    assert 'Mon' in max_partition[0] or ('Mon', 'Dinner') == ast.literal_eval(max_partition[0])
+
+
+def test_calculate_health_scores_matches_single_scores():
+    metrics_list = [
+        DeltaAnalyzerMetrics(number_of_writes=10, number_of_optimizes=1),
+        DeltaAnalyzerMetrics(number_of_writes=4, needs_vacuum=True, skewness_max=0.5),
+        DeltaAnalyzerMetrics(number_of_writes=8, small_files_count=8, has_orphan_files=True),
+    ]
+    scores = DeltaAnalyzerMetrics.calculate_health_scores(metrics_list)
+    assert scores.shape == (3,)
+    assert scores.tolist() == pytest.approx([100.0, 35.0, 63.75])
+    for metrics, score in zip(metrics_list, scores):
+        assert metrics.calculate_health_score() == (score, metrics.health_status)
+    assert [m.health_status for m in metrics_list] == [
+        HealthStatus.HEALTHY, HealthStatus.VERY_UNHEALTHY, HealthStatus.UNHEALTHY
+    ]
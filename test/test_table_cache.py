@@ -0,0 +1,34 @@
+import os
+import shutil
+import pytest
+import polars as pl
+from delta_lake_health.visualization.notebook.table_cache import get_delta_table
+
+
+def _write_versions(table_path, n_versions):
+    shutil.rmtree(table_path, ignore_errors=True)
+    for i in range(n_versions):
+        pl.DataFrame({"id": [i]}).write_delta(table_path, mode="overwrite" if i == 0 else "append")
+
+
+@pytest.mark.parametrize("recreated_versions", [4, 1])
+def test_get_delta_table_after_recreate_lists_existing_files(tmp_path, recreated_versions):
+    table_path = str(tmp_path / "recreated")
+    _write_versions(table_path, 2)
+    assert get_delta_table(table_path).version() == 1
+
+    # Same path, new log: the handle for the old table must not be reused
+    _write_versions(table_path, recreated_versions)
+    dt = get_delta_table(table_path)
+    assert dt.version() == recreated_versions - 1
+    assert len(dt.file_uris()) == recreated_versions
+    assert all(os.path.exists(uri) for uri in dt.file_uris())
+
+
+def test_get_delta_table_picks_up_new_commits(tmp_path):
+    table_path = str(tmp_path / "appended")
+    _write_versions(table_path, 1)
+    dt = get_delta_table(table_path)
+    pl.DataFrame({"id": [1]}).write_delta(table_path, mode="append")
+    assert get_delta_table(table_path) is dt
+    assert dt.version() == 1